@@ -1,14 +1,333 @@
 import math
 import itertools
+from functools import lru_cache
+from typing import List, NamedTuple
+
+import numpy as np
+from numba import njit, prange
+from scipy.spatial.distance import cdist
+
+# Mean Earth radius (km)
+EARTH_RADIUS_KM = 6371.0
+
+
+class TSPResult(NamedTuple):
+    """Result of a TSP solver: closed tour of names, length (km), travel time (min)."""
+    path: List[str]
+    distance_km: float
+    time_min: float
+
+
+# ---------------------------------------------------------------
+# 📐 Distance Matrix
+# ---------------------------------------------------------------
+def haversine_matrix(latlon_deg):
+    """
+    Great-circle distances (km) between every pair of (lat, lon) points.
+    The Haversine formula is evaluated over the whole (n, n) grid at once.
+    """
+    rad = np.deg2rad(np.asarray(latlon_deg, dtype=np.float64).reshape(-1, 2))
+    lat, lon = rad[:, 0], rad[:, 1]
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    cos_lat = np.cos(lat)
+    a = np.sin(dlat / 2)**2 + cos_lat[:, None] * cos_lat[None, :] * np.sin(dlon / 2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def build_sq_distance_matrix(coords):
+    """
+    Squared straight-line (chord) distances (km²) between every pair of
+    (lat, lon) points. Chord length grows monotonically with great-circle
+    distance, so use this wherever only comparisons matter (nearest
+    neighbour, MST) and skip the trig per pair.
+    C-contiguous float32, so it can be passed to nearest_neighbor_route.
+    Not valid for 2-opt: that compares sums of lengths, which squaring
+    does not preserve.
+    """
+    rad = np.deg2rad(np.asarray(coords, dtype=np.float64).reshape(-1, 2))
+    lat, lon = rad[:, 0], rad[:, 1]
+    xyz = np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+    D2 = cdist(xyz, xyz, 'sqeuclidean') * EARTH_RADIUS_KM**2
+    return np.ascontiguousarray(D2, dtype=np.float32)
+
+
+def total_route_distance_from_sq(route, D2, closed=True):
+    """
+    Length (km) of the tour `route` over a squared-chord matrix from
+    build_sq_distance_matrix. Only the legs actually travelled are turned
+    back into great-circle km.
+    """
+    route = np.ascontiguousarray(route, dtype=np.int64)
+    nxt = np.roll(route, -1) if closed else route[1:]
+    chord = np.sqrt(D2[route[:len(nxt)], nxt].astype(np.float64))
+    arc = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / (2 * EARTH_RADIUS_KM), 0.0, 1.0))
+    return float(arc.sum())
+
+
+# Only matrices up to this many points are cached: 128 entries of at most
+# 256² float32 values caps the cache at ~32 MB per process
+DISTANCE_CACHE_MAX_N = 256
+
+
+@lru_cache(maxsize=128)
+def _cached_distance_matrix(points):
+    D = np.ascontiguousarray(haversine_matrix(points), dtype=np.float32)
+    D.flags.writeable = False  # shared between callers; they get copies
+    return D
+
+
+def build_distance_matrix(coords):
+    """
+    Great-circle distances (km) between every pair of (lat, lon) points.
+    Always a C-contiguous float32 array, as the Numba kernels below require.
+    float32 halves the memory traffic of the 2-opt loop and is far more
+    precise than needed for km-scale distances.
+    Matrices for up to DISTANCE_CACHE_MAX_N points are cached on the exact
+    coordinate sequence, so repeat requests for the same stops only pay for
+    a copy; larger ones are built directly to keep memory bounded.
+    """
+    pts = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(pts) > DISTANCE_CACHE_MAX_N:
+        return np.ascontiguousarray(haversine_matrix(pts), dtype=np.float32)
+    return _cached_distance_matrix(tuple(map(tuple, pts.tolist()))).copy()
+
+
+def prep_coordinates(locations, coordinates):
+    """
+    Normalize inputs: returns (ordered_names, xy)
+    xy is a contiguous (n, 2) float64 array of [lat, lon] rows in the same
+    order as `locations`, built once so downstream code never re-boxes floats.
+    Raises ValueError if any location has a NaN/inf coordinate.
+    """
+    names = list(locations)
+    xy = np.fromiter(
+        (float(v) for name in names for v in coordinates[name][:2]),
+        dtype=np.float64,
+        count=2 * len(names),
+    ).reshape(-1, 2)
+    bad = ~np.isfinite(xy).all(axis=1)
+    if bad.any():
+        raise ValueError(f"Invalid coordinates for location: {names[int(np.argmax(bad))]}")
+    return names, xy
+
+
+def create_distance_matrix(locations, coordinates):
+    """
+    Build the full (n, n) distance matrix (in km) for `locations`.
+    Rows/columns of locations without coordinates are inf.
+    """
+    n = len(locations)
+    present = np.array([loc in coordinates for loc in locations], dtype=bool)
+    pts = np.zeros((n, 2), dtype=np.float64)
+    if present.any():
+        pts[present] = [coordinates[loc] for loc in locations if loc in coordinates]
+
+    D = build_distance_matrix(pts)
+    D[~present, :] = np.inf
+    D[:, ~present] = np.inf
+    np.fill_diagonal(D, 0.0)
+    return D
+
+
+def calculate_total_distance(order, D):
+    """
+    Total length (km) of the path visiting node indices `order` in sequence.
+    All legs are gathered from `D` in one fancy-index; legs touching a
+    location without coordinates (inf) are left out of the sum.
+    """
+    order = np.ascontiguousarray(order, dtype=np.int64)
+    legs = np.asarray(D)[order[:-1], order[1:]]
+    total = legs.sum(dtype=np.float64)
+    if np.isfinite(total):
+        return float(total)  # common case: every location has coordinates
+    return float(legs[np.isfinite(legs)].sum(dtype=np.float64))
+
+
+# ---------------------------------------------------------------
+# 🌲 Prim's MST
+# ---------------------------------------------------------------
+def prim_mst(D):
+    """
+    Minimum spanning tree of the complete graph described by matrix `D`,
+    rooted at node 0. Dense O(V²) Prim: each step is one masked np.argmin
+    plus one vectorized key update, which beats a heap on complete graphs.
+    Returns `parent`, where parent[v] is v's parent in the tree (-1 for the root).
+    """
+    D = np.asarray(D)
+    n = len(D)
+    key = np.full(n, np.inf)
+    parent = np.full(n, -1, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+    key[0] = 0.0
+
+    for _ in range(n):
+        u = int(np.argmin(np.where(in_tree, np.inf, key)))
+        in_tree[u] = True
+        closer = ~in_tree & (D[u] < key)
+        key[closer] = D[u, closer]
+        parent[closer] = u
+
+    return parent
+
+
+@njit("int64[::1](int64[::1], int64[::1])", cache=True)
+def _preorder_csr(adj_ptr, adj_idx):
+    n = adj_ptr.shape[0] - 1
+    order = np.empty(n, dtype=np.int64)
+    stack = np.empty(n, dtype=np.int64)  # every node is pushed exactly once
+    stack[0] = 0
+    top = 1
+    k = 0
+    while top > 0:
+        top -= 1
+        u = stack[top]
+        order[k] = u
+        k += 1
+        # Push children in reverse so the smallest index is visited first
+        for e in range(adj_ptr[u + 1] - 1, adj_ptr[u] - 1, -1):
+            stack[top] = adj_idx[e]
+            top += 1
+    return order
+
+
+def preorder_traversal_mst(parent):
+    """
+    Preorder walk of the tree given by `parent` (as returned by prim_mst),
+    starting at the root 0. Visiting nodes in this order is the classic
+    MST 2-approximation of the TSP tour.
+    Children are stored CSR-style (children of u are
+    adj_idx[adj_ptr[u]:adj_ptr[u + 1]]) and walked with an explicit stack.
+    """
+    parent = np.asarray(parent, dtype=np.int64)
+    n = len(parent)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    deg = np.bincount(parent[1:], minlength=n)
+    adj_ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(deg, out=adj_ptr[1:])
+    # A stable sort by parent keeps each child list in ascending order
+    adj_idx = np.argsort(parent[1:], kind='stable').astype(np.int64) + 1
+
+    return _preorder_csr(adj_ptr, adj_idx)
+
 
 # ---------------------------------------------------------------
-# 🧮 Euclidean Distance
+# 🚶 Nearest Neighbour + 2-opt (Numba kernels)
 # ---------------------------------------------------------------
-def euclidean_distance(coord1, coord2):
-    """Calculate Euclidean distance (in km) between two points."""
-    lat1, lon1 = coord1
-    lat2, lon2 = coord2
-    return math.sqrt((lat2 - lat1)**2 + (lon2 - lon1)**2) * 111  # Rough km scaling
+# Contract: D is a C-contiguous float32 (n, n) matrix (see
+# build_distance_matrix) and routes are contiguous int64 arrays.
+# Signatures are explicit so they compile once, on import. Arguments
+# have no defaults, and anything else (lists, float64 matrices, int32
+# routes) is rejected by Numba with a "No matching definition" TypeError.
+@njit("int64[::1](float32[:, ::1], int64)", cache=True, fastmath=True)
+def nearest_neighbor_route(D, start_idx):
+    """
+    Greedy tour from `start_idx`: always move to the closest unvisited node.
+    Returns an open tour as an int64 array of node indices.
+    """
+    n = D.shape[0]
+    visited = np.zeros(n, dtype=np.bool_)
+    route = np.empty(n, dtype=np.int64)
+    route[0] = start_idx
+    cur = route[0]  # int64, whatever integer type start_idx was
+    visited[cur] = True
+
+    for k in range(1, n):
+        nxt = -1
+        nxt_d = np.inf
+        for j in range(n):
+            if not visited[j] and (nxt == -1 or D[cur, j] < nxt_d):
+                nxt = j
+                nxt_d = D[cur, j]
+        route[k] = nxt
+        visited[nxt] = True
+        cur = nxt
+
+    return route
+
+
+@njit("int64[::1](int64[::1], float32[:, ::1])", cache=True, fastmath=True)
+def two_opt(route, D):
+    """
+    Improve a closed tour with 2-opt moves until no move shortens it.
+    `route` is an open tour (int64 array); a new improved array is returned.
+    First-improvement with don't-look bits: a city whose two tour edges
+    admit no improving move is skipped until a move touches it again.
+    """
+    route = route.copy()
+    n = route.shape[0]
+    pos = np.empty(n, dtype=np.int64)  # pos[city] = index of city in route
+    for k in range(n):
+        pos[route[k]] = k
+    dont_look = np.zeros(n, dtype=np.bool_)
+
+    improved = True
+    while improved:
+        improved = False
+        for city in range(n):
+            if dont_look[city]:
+                continue
+            moved = False
+            # Try the edge leaving `city`, then the edge entering it
+            for side in range(2):
+                i = pos[city] if side == 0 else (pos[city] - 1 + n) % n
+                a, b = route[i], route[(i + 1) % n]
+                for j in range(n):
+                    c, d = route[j], route[(j + 1) % n]
+                    if c == a or c == b or d == a:
+                        continue  # same or adjacent edge
+                    # Sum in float64 so a move and its reverse never both look improving
+                    delta = (np.float64(D[a, c]) + D[b, d]) - (np.float64(D[a, b]) + D[c, d])
+                    if delta < -1e-6:
+                        # Reverse route[lo+1 .. hi] in place
+                        lo, hi = min(i, j) + 1, max(i, j)
+                        while lo < hi:
+                            route[lo], route[hi] = route[hi], route[lo]
+                            pos[route[lo]] = lo
+                            pos[route[hi]] = hi
+                            lo += 1
+                            hi -= 1
+                        dont_look[a] = dont_look[b] = dont_look[c] = dont_look[d] = False
+                        moved = True
+                        break
+                if moved:
+                    break
+            if moved:
+                improved = True
+            else:
+                dont_look[city] = True
+
+    return route
+
+
+@njit("float64(int64[::1], float32[:, ::1], boolean)", cache=True)
+def total_route_distance_from_indices(route, D, closed):
+    """Length of the tour `route` (node indices) over matrix `D`, summed in float64."""
+    total = 0.0
+    for k in range(route.shape[0] - 1):
+        total += D[route[k], route[k + 1]]
+    if closed and route.shape[0] > 1:
+        total += D[route[-1], route[0]]
+    return total
+
+
+@njit("Tuple((int64[::1], float64))(float32[:, ::1])", parallel=True, cache=True)
+def multistart_2opt(D):
+    """
+    Nearest neighbour + 2-opt from every start node, spread across CPU cores.
+    Returns (best_route, best_length) over all starts.
+    """
+    n = D.shape[0]
+    routes = np.empty((n, n), dtype=np.int64)
+    dists = np.empty(n, dtype=np.float64)
+    for s in prange(n):
+        routes[s] = two_opt(nearest_neighbor_route(D, s), D)
+        dists[s] = total_route_distance_from_indices(routes[s], D, True)
+
+    best = np.argmin(dists)
+    return routes[best].copy(), dists[best]
 
 
 # ---------------------------------------------------------------
@@ -19,34 +338,34 @@ def basic_tsp(locations, coordinates):
     Basic Traveling Salesman Problem solver using brute force.
     Tries all permutations and finds the minimum total distance.
     """
-    print("\n🚀 Running Basic TSP (Brute Force)...")
-
     n = len(locations)
     if n <= 1:
         return locations, 0.0, 0.0
 
-    min_distance = float('inf')
-    best_path = None
-
-    # Try all possible routes starting from first location
-    start = locations[0]
-    other_locations = locations[1:]
+    # Distances are computed once; each permutation then only adds matrix entries
+    dist = create_distance_matrix(locations, coordinates).tolist()
 
-    for perm in itertools.permutations(other_locations):
-        route = [start] + list(perm) + [start]  # return to start
-        total_distance = 0
+    min_distance = float('inf')
+    best_order = None
 
-        for i in range(len(route) - 1):
-            loc1, loc2 = route[i], route[i + 1]
-            if loc1 in coordinates and loc2 in coordinates:
-                total_distance += euclidean_distance(coordinates[loc1], coordinates[loc2])
-            else:
-                total_distance = float('inf')
-                break
+    # Try all possible routes starting from first location (index 0)
+    for perm in itertools.permutations(range(1, n)):
+        total_distance = dist[0][perm[0]]
+        prev = perm[0]
+        for cur in perm[1:]:
+            if total_distance >= min_distance:
+                break  # already no shorter than the best route; prune
+            total_distance += dist[prev][cur]
+            prev = cur
+        else:
+            total_distance += dist[prev][0]  # return to start
+            if total_distance < min_distance:
+                min_distance = total_distance
+                best_order = perm
 
-        if total_distance < min_distance:
-            min_distance = total_distance
-            best_path = route
+    best_path = None
+    if best_order is not None:
+        best_path = [locations[0]] + [locations[i] for i in best_order] + [locations[0]]
 
     # Estimate travel time (assuming average 40 km/h)
     avg_speed_kmh = 40
@@ -55,4 +374,102 @@ def basic_tsp(locations, coordinates):
 
     return best_path, round(min_distance, 2), round(estimated_time_hr, 2)
 
-    
+
+
+# ---------------------------------------------------------------
+# 🎯 Exact TSP (Held-Karp)
+# ---------------------------------------------------------------
+# Above this size tsp_bruteforce switches from enumeration to Held-Karp
+BRUTE_FORCE_MAX_N = 4
+# Held-Karp needs ~5 · n · 2ⁿ bytes and a Python loop over 2ⁿ⁻¹ masks
+HELD_KARP_MAX_N = 16
+
+
+def held_karp(D):
+    """
+    Exact TSP over distance matrix `D` using Held-Karp bitmask DP, O(n² · 2ⁿ).
+    The tour starts and ends at node 0. Memory grows as 2ⁿ · n, so n is
+    capped at HELD_KARP_MAX_N (ValueError above that).
+    Returns (order, length) where `order` is the open tour of node indices,
+    or (None, inf) if no finite tour exists.
+    """
+    D = np.asarray(D, dtype=np.float64)
+    n = len(D)
+    if n > HELD_KARP_MAX_N:
+        raise ValueError(f"Exact TSP supports at most {HELD_KARP_MAX_N} locations (got {n})")
+    if n <= 1:
+        return list(range(n)), 0.0
+
+    size = 1 << n
+    nodes = np.arange(n)
+    bits = 1 << nodes
+    # dp[mask, j]: shortest path from 0 through exactly `mask`, ending at j
+    dp = np.full((size, n), np.inf, dtype=np.float32)
+    parent = np.full((size, n), -1, dtype=np.int8)
+    dp[1, 0] = 0.0
+
+    # Every subset is smaller than its supersets, so ascending order is safe.
+    # Only odd masks contain the start node.
+    for mask in range(1, size, 2):
+        outside = (mask & bits) == 0
+        if not outside.any():
+            continue
+        # cand[i, j]: path ending at i, extended by edge i -> j
+        cand = dp[mask][:, None] + D
+        prev = np.argmin(cand, axis=0)
+        best = cand[prev, nodes]
+
+        js = nodes[outside]
+        new = mask | bits[js]
+        better = best[js] < dp[new, js]
+        new, js = new[better], js[better]
+        dp[new, js] = best[js]
+        parent[new, js] = prev[js]
+
+    full = size - 1
+    closing = dp[full] + D[:, 0]
+    closing[0] = np.inf
+    last = int(np.argmin(closing))
+    if not np.isfinite(closing[last]):
+        return None, math.inf
+
+    order = []
+    mask, node = full, last
+    while node != 0:
+        order.append(node)
+        mask, node = mask ^ (1 << node), int(parent[mask, node])
+    order.append(0)
+    order.reverse()
+
+    length = calculate_total_distance(order + order[:1], D)
+    return order, length
+
+
+def tsp_bruteforce(locations, coordinates):
+    """
+    Exact TSP solver. Tiny inputs are enumerated with basic_tsp; anything
+    larger goes through Held-Karp, which finds the same optimum without
+    trying all (n-1)! permutations. At most HELD_KARP_MAX_N locations.
+    Returns TSPResult(closed_path, total_distance_km, estimated_time_min).
+    Raises ValueError for missing or non-finite coordinates.
+    """
+    for loc in locations:
+        if loc not in coordinates:
+            raise ValueError(f"Missing coordinates for location: {loc}")
+    prep_coordinates(locations, coordinates)  # raises on NaN/inf coordinates
+
+    n = len(locations)
+    if n <= BRUTE_FORCE_MAX_N:
+        best_path, total_distance, _ = basic_tsp(locations, coordinates)
+    else:
+        order, total_distance = held_karp(create_distance_matrix(locations, coordinates))
+        best_path = None if order is None else [locations[i] for i in order] + [locations[0]]
+
+    if best_path is None:
+        raise ValueError("No finite route exists through the given locations")
+
+    # Estimate travel time (assuming average 40 km/h)
+    avg_speed_kmh = 40
+    estimated_time_min = total_distance / avg_speed_kmh * 60
+
+    return TSPResult(best_path, round(total_distance, 2), round(estimated_time_min, 2))
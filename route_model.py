@@ -9,12 +9,20 @@ Utility module that:
  - returns a consistent result dict suitable for JSON response
 
 Functions:
- - geocode_place(place, api_key=None) -> (lat, lon) or raises
+ - geocode_place(place, api_key=None, session=None) -> (lat, lon) or raises
  - generate_optimized_path(place_names, api_key=None, coordinates=None, brute_force_threshold=8)
 """
 
 import os
+import json
+import tempfile
+import threading
 import requests
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from typing import List, Dict, Tuple, Optional
 
@@ -23,19 +31,90 @@ load_dotenv()
 # prefer OPENCAGE_API_KEY env var name to match your app.py
 DEFAULT_OPENCAGE_API_KEY = os.getenv("OPENCAGE_API_KEY")
 
-# import algorithms (ensure algos.py provides tsp_bruteforce and find_optimized_route)
-from algos import tsp_bruteforce, find_optimized_route
+# geocoding results are cached on disk (normalized place -> [lat, lon])
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", ".geocache.json")
+
+# process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# max concurrent geocoding requests per generate_optimized_path call
+GEOCODE_MAX_WORKERS = 8
+
+# one keep-alive session so repeated lookups reuse the TLS connection
+_SESSION = requests.Session()
+
+# import algorithms
+from algos import tsp_bruteforce, HELD_KARP_MAX_N
+from tsp_modified import find_optimized_route
+
+
+# -------------------------
+# Helper: Geocoding cache
+# -------------------------
+def _load_geocode_cache() -> Dict[str, List[float]]:
+    try:
+        with open(GEOCODE_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_geocode_cache = _load_geocode_cache()
+_geocode_cache_lock = threading.Lock()
+
+
+def _save_geocode_cache() -> None:
+    # Hold an exclusive lock on a sidecar file across load -> merge -> replace so
+    # concurrent writers (e.g. gunicorn workers) can't drop each other's entries.
+    # Without fcntl (Windows) the write is best-effort: the last writer wins.
+    try:
+        lock_file = open(GEOCODE_CACHE_PATH + ".lock", "a")
+    except OSError:
+        return  # cache is best-effort; a read-only disk just means no persistence
+    with lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        # merge in entries other processes added since we loaded
+        merged = _load_geocode_cache()
+        merged.update(_geocode_cache)
+        _geocode_cache.update(merged)
+
+        # write to a unique temp file first so a crash never leaves a half-written cache
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(GEOCODE_CACHE_PATH) or ".", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(merged, f)
+            os.chmod(tmp_path, 0o666 & ~_UMASK)  # mkstemp creates 0600
+            os.replace(tmp_path, GEOCODE_CACHE_PATH)
+        except OSError:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
 
 # -------------------------
 # Helper: Geocode a single place (OpenCage)
 # -------------------------
-def geocode_place(place: str, api_key: Optional[str] = None) -> Tuple[float, float]:
+def geocode_place(
+    place: str,
+    api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> Tuple[float, float]:
     """
     Geocode `place` using OpenCage Geocoding API.
+    Requests go through `session` (default: a shared module-level Session).
+    Results are cached in memory and on disk (GEOCODE_CACHE_PATH), keyed on the
+    lower-cased, stripped place name, so repeat lookups skip the HTTP call.
     Returns (lat, lon).
     Raises ValueError on failure.
     """
+    cache_key = place.strip().lower()
+    cached = _geocode_cache.get(cache_key)
+    if cached is not None:
+        return float(cached[0]), float(cached[1])
+
     key = api_key or DEFAULT_OPENCAGE_API_KEY
     if not key:
         raise ValueError("OpenCage API key required (OPENCAGE_API_KEY env var or api_key arg).")
@@ -44,7 +123,7 @@ def geocode_place(place: str, api_key: Optional[str] = None) -> Tuple[float, flo
     params = {"q": place, "key": key, "limit": 1}
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = (session or _SESSION).get(url, params=params, timeout=10)
         resp.raise_for_status()
         doc = resp.json()
     except requests.RequestException as e:
@@ -58,7 +137,11 @@ def geocode_place(place: str, api_key: Optional[str] = None) -> Tuple[float, flo
     if not geometry or "lat" not in geometry or "lng" not in geometry:
         raise ValueError(f"Invalid geocoding response for: {place}")
 
-    return float(geometry["lat"]), float(geometry["lng"])
+    lat, lon = float(geometry["lat"]), float(geometry["lng"])
+    with _geocode_cache_lock:
+        _geocode_cache[cache_key] = [lat, lon]
+        _save_geocode_cache()
+    return lat, lon
 
 
 # -------------------------
@@ -76,7 +159,7 @@ def generate_optimized_path(
       - geocode each place with OpenCage to create coordinates.
 
     Then select algorithm:
-      - if n <= brute_force_threshold -> tsp_bruteforce (exact)
+      - if n <= brute_force_threshold (capped at HELD_KARP_MAX_N) -> tsp_bruteforce (exact)
       - else -> find_optimized_route (hybrid MST + TSP)
 
     Returns a dict:
@@ -95,77 +178,48 @@ def generate_optimized_path(
     # build coordinates dict if not provided
     coords = {} if coordinates is None else dict(coordinates)  # shallow copy
 
-    # geocode missing entries
-    for place in place_names:
-        if place in coords:
-            continue
-        try:
-            lat, lon = geocode_place(place, api_key=api_key)
-            coords[place] = (lat, lon)
-        except Exception as e:
-            # bubble up with clear message
-            raise ValueError(f"Geocoding failed for '{place}': {e}")
+    # geocode missing entries concurrently (network-bound, so threads are fine)
+    to_geocode = [p for p in dict.fromkeys(place_names) if p not in coords]
+    if to_geocode:
+        with ThreadPoolExecutor(max_workers=min(GEOCODE_MAX_WORKERS, len(to_geocode))) as ex:
+            futures = {place: ex.submit(geocode_place, place, api_key, _SESSION) for place in to_geocode}
+        for place, future in futures.items():
+            try:
+                coords[place] = future.result()
+            except Exception as e:
+                # bubble up with clear message
+                raise ValueError(f"Geocoding failed for '{place}': {e}")
 
     # validate coords for all requested places
     missing = [p for p in place_names if p not in coords]
     if missing:
         raise ValueError(f"No coordinates for places: {missing}")
 
-    # choose algorithm
+    # choose algorithm; both solvers return algos.TSPResult
     n = len(place_names)
-    if n <= brute_force_threshold:
-        # tsp_bruteforce returns (optimized_path:list, total_distance:float, total_time_min:float)
+    if n <= min(brute_force_threshold, HELD_KARP_MAX_N):
         result = tsp_bruteforce(place_names, coords)
-        # tsp_bruteforce in some variants returns either (path, dist) or (path, dist, time).
-        # Normalize:
-        if isinstance(result, tuple) and len(result) == 3:
-            optimized_path, total_distance_km, estimated_time_min = result
-        elif isinstance(result, tuple) and len(result) == 2:
-            optimized_path, total_distance_km = result
-            avg_speed_kmh = 40
-            estimated_time_min = (total_distance_km / avg_speed_kmh) * 60
-        else:
-            raise ValueError("tsp_bruteforce returned unexpected format.")
         algo_used = "brute_force_tsp"
     else:
-        # find_optimized_route returns dict or tuple depending on your algos.py — normalize here
         result = find_optimized_route(place_names, coords)
-        if isinstance(result, dict):
-            optimized_path = result.get("optimized_path") or result.get("route") or []
-            total_distance_km = result.get("total_distance") or result.get("total_distance_km") or 0
-            # find_optimized_route earlier returned estimated_time in hours sometimes; normalize to minutes
-            est = result.get("estimated_time") or result.get("estimated_time_hr") or result.get("estimated_time_min") or 0
-            # If estimated_time looks like hours (< 10 generally) treat as hours
-            if est and est < 10 and total_distance_km > 0:
-                # ambiguous: treat as hours if small; but make robust: check keys
-                if "estimated_time_hr" in result or "estimated_time" in result and result.get("estimated_time") <= 10:
-                    estimated_time_min = float(est) * 60
-                else:
-                    estimated_time_min = float(est)
-            else:
-                estimated_time_min = float(est)
-            algo_used = "mst_preorder_tsp"
-        elif isinstance(result, tuple) and len(result) == 3:
-            optimized_path, total_distance_km, estimated_time_min = result
-            algo_used = "mst_preorder_tsp"
-        else:
-            raise ValueError("find_optimized_route returned unexpected format.")
+        algo_used = "mst_preorder_tsp"
 
     # prepare route coordinates (lat, lon) in order
+    get_coords = coords.get
     route_coords = []
-    for name in optimized_path:
-        if name in coords:
-            route_coords.append([coords[name][0], coords[name][1]])
-        else:
+    for name in result.path:
+        latlon = get_coords(name)
+        if latlon is None:
             # skip or raise — here we skip silently
             continue
+        route_coords.append([latlon[0], latlon[1]])
 
     message = f"Route computed using {algo_used}."
 
     return {
-        "optimized_path": optimized_path,
-        "total_distance": round(float(total_distance_km), 2),
-        "estimated_time": round(float(estimated_time_min), 2),  # minutes
+        "optimized_path": result.path,
+        "total_distance": round(result.distance_km, 2),
+        "estimated_time": round(result.time_min, 2),  # minutes
         "route_coordinates": route_coords,
         "message": message
     }
@@ -179,7 +233,6 @@ if __name__ == "__main__":
     places = ["Pune, India", "Mumbai, India", "Nashik, India"]
     try:
         out = generate_optimized_path(places)
-        import json
         print(json.dumps(out, indent=2))
     except Exception as e:
         print("Test failed:", e)